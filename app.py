@@ -10,6 +10,7 @@ from flask_mail import Mail, Message
 import secrets
 import string
 import certifi
+import atexit
 from threading import Lock
 from email_client import EmailClient
 
@@ -101,6 +102,7 @@ app.config['MAIL_USERNAME'] = os.environ.get('MAIL_USERNAME')
 app.config['MAIL_PASSWORD'] = os.environ.get('MAIL_PASSWORD')
 mail = Mail(app)
 email_client = EmailClient(app, mail)
+atexit.register(email_client.close)
 print(f"Email provider: {email_client.provider}")
 
 # Login Manager
@@ -1,16 +1,189 @@
 import os
 import time
+import enum
+import smtplib
+import asyncio
+import random
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+import warnings
+from typing import List, Optional, Dict, Any, Tuple
 
-import requests
-from flask_mail import Message
+import orjson
+
+BREVO_SEND_URL = "https://api.brevo.com/v3/smtp/email"
+# Brevo accepts at most this many messageVersions in one request
+BREVO_MAX_VERSIONS = 1000
+BREVO_BATCH_SIZE = 500
+# A rejected batch is first probed with this many single sends; if none of
+# them go through either, the request itself is bad and the rest are skipped
+BREVO_FALLBACK_PROBES = 3
+# A 500-version body takes Brevo far longer to answer than a single send
+BREVO_TIMEOUT_S = 15.0
+BREVO_BATCH_TIMEOUT_S = 120.0
+# The SMTP relay has no rate-limit headers to follow, so Flask-Mail bulk
+# sends keep a fixed pause (delay +/- jitter/2 seconds) between batches
+SMTP_BATCH_SIZE = 50
+SMTP_BATCH_DELAY_S = 30.0
+SMTP_BATCH_JITTER_S = 5.0
+# Bulk runs stop early once more than this share of at least
+# ABORT_MIN_PROCESSED recipients has failed (provider is likely down)
+ABORT_MIN_PROCESSED = 30
+ABORT_FAILURE_RATIO = 1 / 3
+# Longest a single (interactive) send waits on the rate limiter before giving
+# up, so request handlers never block a worker for a whole quota window
+SINGLE_SEND_MAX_WAIT_S = 5.0
+
+
+class SendResult(enum.Enum):
+    """Outcome of one send attempt. Only RETRY is worth another attempt."""
+
+    SENT = "sent"
+    RETRY = "retry"
+    FATAL = "fatal"
+
+
+def _classify_status(status: int) -> SendResult:
+    if 200 <= status < 300:
+        return SendResult.SENT
+    # Rate limiting and server errors are transient; other 4xx won't improve
+    if status == 429 or status >= 500:
+        return SendResult.RETRY
+    return SendResult.FATAL
+
+
+def _blames_recipient(status: int, content: bytes) -> bool:
+    """True if a Brevo 400 could be down to one bad parameter, such as a recipient address."""
+    if status != 400:
+        return False
+    try:
+        data = orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return False
+    # Brevo's machine-readable error code; missing/unauthorized/credit errors affect every recipient
+    return isinstance(data, dict) and data.get("code") == "invalid_parameter"
+
+
+def _should_abort(processed: int, failed: int) -> bool:
+    return processed >= ABORT_MIN_PROCESSED and failed / processed > ABORT_FAILURE_RATIO
+
+
+def _abort_reason(sent: int, failed: int) -> str:
+    return f"Aborted after {failed} of {sent + failed} sends failed"
+
+
+def _bulk_summary(
+    label: str, total: int, sent: int, failed: int, errors: List[str], aborted: bool
+) -> Dict[str, Any]:
+    """Summary dict returned by every bulk path; logs why an aborted run stopped."""
+    if aborted:
+        logging.error(f"{label} bulk send aborted: {errors[-1]}")
+    return {"sent": sent, "failed": failed, "total": total, "errors": errors, "aborted": aborted}
+
+
+def _transient_http_errors() -> tuple:
+    """httpx errors worth retrying: timeouts and dropped or refused connections."""
+    import httpx  # lazy import, see EmailClient._sync_client
+
+    return (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)
+
+
+def _unsent_http_errors() -> tuple:
+    """httpx errors raised before the request reached the provider, so a retry can't duplicate it."""
+    import httpx  # lazy import, see EmailClient._sync_client
+
+    return (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _classify_smtp_error(exc: Exception) -> SendResult:
+    # Refused recipients won't succeed on a retry
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return SendResult.FATAL
+    # Server replied with a code: 4xx is temporary, 5xx (bad login, quota, ...) is permanent
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return SendResult.RETRY if 400 <= exc.smtp_code < 500 else SendResult.FATAL
+    # Dropped connections and socket errors
+    if isinstance(exc, (smtplib.SMTPException, OSError)):
+        return SendResult.RETRY
+    return SendResult.FATAL
+
+
+class TokenBucket:
+    """
+    Thread-safe limiter following the provider's quota window: `capacity`
+    calls per `window` seconds, refilled in full when the window resets.
+    Starts from a conservative default and is re-tuned from the quota
+    headers on each response. Waiting callers re-check it every `poll_s`
+    seconds, so later updates and pauses apply to them too.
+    """
+
+    poll_s = 1.0
+
+    def __init__(self, capacity: float = 10.0, window: float = 1.0):
+        self.capacity = capacity
+        self.window = window
+        self._tokens = capacity
+        self._window_end = time.monotonic() + window
+        self._blocked_until = 0.0
+        self._tuned = False
+        self._lock = threading.Lock()
+
+    def _try_take(self) -> float:
+        """Take a token and return 0, or return how long until one may be free."""
+        with self._lock:
+            now = time.monotonic()
+            if now >= self._window_end:
+                self._tokens = self.capacity
+                self._window_end = now + self.window
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return max(self._window_end - now, 1e-3)
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Block until a token is available; False once that looks like taking longer than `max_wait`."""
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            wait = self._try_take()
+            if not wait:
+                return True
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(min(wait, self.poll_s))
+
+    async def acquire_async(self) -> None:
+        while True:
+            wait = self._try_take()
+            if not wait:
+                return
+            await asyncio.sleep(min(wait, self.poll_s))
+
+    def update(self, remaining: float, reset: float) -> None:
+        """Adopt the provider's view: `remaining` calls left, window resets in `reset` seconds."""
+        if reset <= 0:
+            return
+        with self._lock:
+            # The quota only ever shows up as what's left; the largest seen
+            # since the default was dropped is our best guess at it
+            if not self._tuned:
+                self.capacity, self.window, self._tuned = 0.0, 0.0, True
+            self.capacity = max(self.capacity, float(remaining))
+            self.window = max(self.window, float(reset))
+            self._tokens = max(0.0, float(remaining))
+            self._window_end = time.monotonic() + reset
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for `seconds` from now (e.g. a 429 Retry-After)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
 
 
 class EmailClient:
     """
     Unified email client with support for Brevo (Sendinblue) API for bulk sending,
-    with batching, pacing, and basic retries. Falls back to Flask-Mail if no API key.
+    with batching, rate limiting, and retries. Falls back to Flask-Mail if no API key.
     """
 
     def __init__(self, flask_app=None, flask_mail=None):
@@ -28,11 +201,38 @@ class EmailClient:
             else:
                 self.provider = "flask_mail"
 
+        # Shared by sync and async Brevo sends; tuned from X-Sib-RateLimit-* headers
+        self._rate = TokenBucket()
+        # Jitter source for retry backoff; doesn't need to be cryptographic
+        self._rng = random.Random()
+
+        # Static parts of every Brevo request, built once
+        self._brevo_url = BREVO_SEND_URL
+        self._brevo_sender = {"email": self.from_email, "name": self.from_name}
+        self._brevo_headers = {
+            "api-key": self.brevo_key or "",
+            "accept": "application/json",
+            "content-type": "application/json",
+        }
+
+        # Pooled HTTP/2 client, created on first Brevo send (see _sync_client)
+        self._http = None
+        self._http_lock = threading.Lock()
+
+    def close(self) -> None:
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     # ---------- Public API ----------
     def send_single(self, to: str, subject: str, body_text: str, body_html: Optional[str] = None) -> bool:
-        if self.provider == "brevo":
-            return self._brevo_send_single(to, subject, body_text, body_html)
-        return self._flask_mail_send_single(to, subject, body_text, body_html)
+        return self._send_once(to, subject, body_text, body_html) is SendResult.SENT
 
     def send_bulk(
         self,
@@ -40,104 +240,434 @@ class EmailClient:
         subject: str,
         body_text: str,
         body_html: Optional[str] = None,
-        batch_size: int = 50,
-        delay_s: float = 30.0,
+        batch_size: Optional[int] = None,
+        max_retries: int = 3,
+        concurrency: int = 16,
+        delay_s: Optional[float] = None,
+        jitter_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send to many recipients with batching and retries.
+        Brevo sends run concurrently via send_bulk_async and are paced by the
+        provider-driven rate limiter; this stays a plain sync call so Flask
+        request handlers can use it directly. Flask-Mail sends go through
+        send_bulk_flask_mail, paced by `delay_s`/`jitter_s` between batches.
+        `batch_size` defaults per provider; `concurrency` only applies to Brevo.
+        Returns a summary dict with counts; `aborted` is True if the run
+        stopped early because too many sends were failing.
+        """
+        if self.provider == "brevo":
+            if delay_s is not None or jitter_s is not None:
+                warnings.warn(
+                    "delay_s/jitter_s are ignored for Brevo; pacing follows the provider's rate-limit headers",
+                    DeprecationWarning,
+                    stacklevel=2,
+                )
+            return asyncio.run(
+                self.send_bulk_async(
+                    recipients, subject, body_text, body_html,
+                    batch_size=batch_size or BREVO_BATCH_SIZE, max_retries=max_retries, concurrency=concurrency,
+                )
+            )
+        return self.send_bulk_flask_mail(
+            recipients, subject, body_text, body_html,
+            max_retries=max_retries,
+            batch_size=batch_size or SMTP_BATCH_SIZE,
+            delay_s=SMTP_BATCH_DELAY_S if delay_s is None else delay_s,
+            jitter_s=SMTP_BATCH_JITTER_S if jitter_s is None else jitter_s,
+        )
+
+    def send_bulk_flask_mail(
+        self,
+        recipients: List[str],
+        subject: str,
+        body_text: str,
+        body_html: Optional[str] = None,
         max_retries: int = 3,
-        jitter_s: float = 5.0,
+        batch_size: int = SMTP_BATCH_SIZE,
+        delay_s: float = SMTP_BATCH_DELAY_S,
+        jitter_s: float = SMTP_BATCH_JITTER_S,
     ) -> Dict[str, Any]:
         """
-        Send to many recipients with batching, pacing, and simple retries.
-        Returns a summary dict with counts.
+        Flask-Mail bulk send: each batch of `batch_size` recipients shares one
+        SMTP session, with a `delay_s` (+/- jitter) pause between batches.
+        A recipient whose send fails transiently is retried on its own, then
+        a fresh session is opened for the rest. Same summary dict as send_bulk.
         """
         success = 0
         failed = 0
+        aborted = False
         errors: List[str] = []
 
-        # Normalize and de-duplicate recipients
-        deduped = []
-        seen = set()
-        for r in recipients:
-            if not r:
-                continue
-            e = r.strip().lower()
-            if e and e not in seen:
-                seen.add(e)
-                deduped.append(e)
-
-        for i in range(0, len(deduped), batch_size):
-            batch = deduped[i : i + batch_size]
-            # Prefer sending individually for better deliverability
-            for rcpt in batch:
-                ok = self._send_with_retries(rcpt, subject, body_text, body_html, max_retries)
-                if ok:
-                    success += 1
-                else:
-                    failed += 1
-            # Pace between batches
-            if i + batch_size < len(deduped):
-                sleep_time = max(0.0, delay_s + (jitter_s * (0.5 - os.urandom(1)[0] / 255.0)))
-                time.sleep(sleep_time)
+        deduped = self._normalize_recipients(recipients)
+        if not self._mail or not self._app:
+            logging.error("Flask-Mail not available")
+            return _bulk_summary("Flask-Mail", len(deduped), 0, len(deduped), errors, False)
 
-        return {"sent": success, "failed": failed, "total": len(deduped), "errors": errors}
+        batch_size = max(1, batch_size)
+        i = 0
+        session_failures = 0
+        with self._app.app_context():
+            while i < len(deduped):
+                batch_end = min(len(deduped), (i // batch_size + 1) * batch_size)
+                connected = False
+                try:
+                    with self._mail.connect() as conn:
+                        connected = True
+                        session_failures = 0
+                        while i < batch_end:
+                            conn.send(self._flask_mail_message(deduped[i], subject, body_text, body_html))
+                            success += 1
+                            i += 1
+                except Exception as e:
+                    result = _classify_smtp_error(e)
+                    if not connected:
+                        # Couldn't connect/log in: retry opening the session if that
+                        # looks transient, otherwise no recipient can be sent
+                        logging.error(f"Flask-Mail could not open SMTP session: {e}")
+                        if result is SendResult.RETRY and session_failures < max_retries:
+                            time.sleep(self._backoff(session_failures))
+                            session_failures += 1
+                            continue
+                        failed += len(deduped) - i
+                        aborted = True
+                        errors.append(f"Could not open SMTP session: {e}")
+                        break
+                    if i >= batch_end:
+                        # The whole batch went out; only closing the session failed
+                        logging.warning(f"Flask-Mail error closing SMTP session: {e}")
+                    else:
+                        logging.error(f"Flask-Mail send error: {e}")
+                        # The batched attempt counts as the first try
+                        if result is SendResult.RETRY and max_retries > 0 and self._flask_mail_send_with_retries(
+                            deduped[i], subject, body_text, body_html, max_retries - 1
+                        ):
+                            success += 1
+                        else:
+                            failed += 1
+                        i += 1
+                        if _should_abort(success + failed, failed):
+                            aborted = True
+                            errors.append(_abort_reason(success, failed))
+                            break
+                # Pace between batches
+                if i == batch_end and i < len(deduped):
+                    time.sleep(max(0.0, delay_s + jitter_s * (self._rng.random() - 0.5)))
+
+        return _bulk_summary("Flask-Mail", len(deduped), success, failed, errors, aborted)
+
+    async def send_bulk_async(
+        self,
+        recipients: List[str],
+        subject: str,
+        body_text: str,
+        body_html: Optional[str] = None,
+        batch_size: int = BREVO_BATCH_SIZE,
+        max_retries: int = 3,
+        concurrency: int = 16,
+    ) -> Dict[str, Any]:
+        """
+        Brevo bulk send. Each batch of up to `batch_size` recipients goes out as
+        one request using `messageVersions`, with up to `concurrency` requests
+        in flight, multiplexed over HTTP/2 where the provider supports it.
+        Same summary dict as send_bulk.
+        """
+        import httpx  # lazy import, only needed for bulk sends
+
+        success = 0
+        failed = 0
+        aborted = False
+        errors: List[str] = []
+
+        deduped = self._normalize_recipients(recipients)
+        batch_size = max(1, min(batch_size, BREVO_MAX_VERSIONS))
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async with httpx.AsyncClient(
+            http2=True,
+            headers=self._brevo_headers,
+            timeout=BREVO_TIMEOUT_S,
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+        ) as client:
+            tasks = [
+                asyncio.ensure_future(self._send_batch_with_retries_async(
+                    client, sem, deduped[i : i + batch_size], subject, body_text, body_html, max_retries
+                ))
+                for i in range(0, len(deduped), batch_size)
+            ]
+            for fut in asyncio.as_completed(tasks):
+                sent, batch_failed = await fut
+                success += sent
+                failed += batch_failed
+                if _should_abort(success + failed, failed):
+                    aborted = True
+                    break
+            if aborted:
+                # Stop the remaining batches before the client closes
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        if aborted:
+            errors.append(_abort_reason(success, failed))
+        return _bulk_summary("Brevo", len(deduped), success, failed, errors, aborted)
 
     # ---------- Internal helpers ----------
-    def _send_with_retries(self, to: str, subject: str, body_text: str, body_html: Optional[str], max_retries: int) -> bool:
-        attempt = 0
-        delay = 2.0
-        while attempt <= max_retries:
-            ok = self.send_single(to, subject, body_text, body_html)
-            if ok:
+    @staticmethod
+    def _normalize_recipients(recipients: List[str]) -> List[str]:
+        """Lower-case, strip and de-duplicate recipients, preserving order."""
+        return list(dict.fromkeys(r.strip().lower() for r in recipients if r and r.strip()))
+
+    def _backoff(self, attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+        """Full-jitter exponential backoff, so recipients failing together don't retry in lockstep."""
+        return self._rng.uniform(0, min(cap, base * (2 ** attempt)))
+
+    def _send_once(self, to: str, subject: str, body_text: str, body_html: Optional[str]) -> SendResult:
+        if self.provider == "brevo":
+            return self._brevo_send_single(to, subject, body_text, body_html)
+        return self._flask_mail_send_single(to, subject, body_text, body_html)
+
+    async def _send_with_retries_async(
+        self, client, sem: asyncio.Semaphore, to: str, subject: str, body_text: str,
+        body_html: Optional[str], max_retries: int,
+    ) -> bool:
+        body = self._build_brevo_payload(to, subject, body_text, body_html)
+        for attempt in range(max_retries + 1):
+            # Only the request itself holds a slot; backoff sleeps don't
+            async with sem:
+                result = await self._post_brevo_async(client, body)
+            if result is SendResult.SENT:
                 return True
-            attempt += 1
-            time.sleep(delay)
-            delay = min(60.0, delay * 2)
+            if result is SendResult.FATAL:
+                return False
+            if attempt < max_retries:
+                await asyncio.sleep(self._backoff(attempt))
         return False
 
+    async def _send_batch_with_retries_async(
+        self, client, sem: asyncio.Semaphore, batch: List[str], subject: str, body_text: str,
+        body_html: Optional[str], max_retries: int,
+    ) -> Tuple[int, int]:
+        """Send one messageVersions batch; returns (sent, failed) counts."""
+        body = self._build_brevo_batch_payload(batch, subject, body_text, body_html)
+        for attempt in range(max_retries + 1):
+            async with sem:
+                result, sent, recipient_error = await self._post_brevo_batch_async(client, body, len(batch))
+            if result is SendResult.SENT:
+                return sent, len(batch) - sent
+            if result is SendResult.FATAL:
+                break
+            if attempt < max_retries:
+                await asyncio.sleep(self._backoff(attempt))
+
+        # Brevo rejects the whole request if any address is invalid; send the
+        # batch one by one so a single bad row doesn't fail everyone else
+        if result is SendResult.FATAL and recipient_error and len(batch) > 1:
+            return await self._send_individually_async(
+                client, sem, batch, subject, body_text, body_html, max_retries
+            )
+        return 0, len(batch)
+
+    async def _send_individually_async(
+        self, client, sem: asyncio.Semaphore, batch: List[str], subject: str, body_text: str,
+        body_html: Optional[str], max_retries: int,
+    ) -> Tuple[int, int]:
+        """Per-recipient fallback for a rejected batch; unsent recipients count as failed."""
+        probes = batch[:BREVO_FALLBACK_PROBES]
+        sent = await self._send_each_async(client, sem, probes, subject, body_text, body_html, max_retries)
+        if not sent:
+            logging.error(f"Brevo per-recipient fallback: all {len(probes)} probe sends failed, skipping the rest")
+            return 0, len(batch)
+        sent += await self._send_each_async(
+            client, sem, batch[len(probes):], subject, body_text, body_html, max_retries
+        )
+        return sent, len(batch) - sent
+
+    async def _send_each_async(
+        self, client, sem: asyncio.Semaphore, recipients: List[str], subject: str, body_text: str,
+        body_html: Optional[str], max_retries: int,
+    ) -> int:
+        """Send to each recipient on its own; returns how many were sent, stopping early if most fail."""
+        tasks = [
+            asyncio.ensure_future(
+                self._send_with_retries_async(client, sem, rcpt, subject, body_text, body_html, max_retries)
+            )
+            for rcpt in recipients
+        ]
+        sent = 0
+        failed = 0
+        try:
+            for fut in asyncio.as_completed(tasks):
+                if await fut:
+                    sent += 1
+                else:
+                    failed += 1
+                if _should_abort(sent + failed, failed):
+                    logging.error(f"Brevo per-recipient fallback: {_abort_reason(sent, failed)}")
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return sent
+
     # ---------- Flask-Mail fallback ----------
-    def _flask_mail_send_single(self, to: str, subject: str, body_text: str, body_html: Optional[str]) -> bool:
+    def _flask_mail_message(self, to: str, subject: str, body_text: str, body_html: Optional[str]):
+        from flask_mail import Message  # lazy import
+
+        msg = Message(subject, sender=self.from_email, recipients=[to])
+        msg.body = body_text
+        if body_html:
+            msg.html = body_html
+        return msg
+
+    def _flask_mail_send_single(self, to: str, subject: str, body_text: str, body_html: Optional[str]) -> SendResult:
         if not self._mail or not self._app:
             logging.error("Flask-Mail not available")
-            return False
+            return SendResult.FATAL
         try:
             with self._app.app_context():
-                msg = Message(subject, sender=self.from_email, recipients=[to])
-                msg.body = body_text
-                if body_html:
-                    msg.html = body_html
-                self._mail.send(msg)
-            return True
+                self._mail.send(self._flask_mail_message(to, subject, body_text, body_html))
+            return SendResult.SENT
         except Exception as e:
             logging.error(f"Flask-Mail send error: {e}")
-            return False
+            return _classify_smtp_error(e)
+
+    def _flask_mail_send_with_retries(
+        self, to: str, subject: str, body_text: str, body_html: Optional[str], max_retries: int
+    ) -> bool:
+        for attempt in range(max_retries + 1):
+            result = self._flask_mail_send_single(to, subject, body_text, body_html)
+            if result is SendResult.SENT:
+                return True
+            if result is SendResult.FATAL:
+                return False
+            if attempt < max_retries:
+                time.sleep(self._backoff(attempt))
+        return False
 
     # ---------- Brevo (Sendinblue) ----------
-    def _brevo_send_single(self, to: str, subject: str, body_text: str, body_html: Optional[str]) -> bool:
+    def _observe_rate_limit(self, status: int, headers) -> None:
+        """Feed Brevo's quota headers into the token bucket; back off on 429."""
+        try:
+            remaining = headers.get("x-sib-ratelimit-remaining")
+            reset = headers.get("x-sib-ratelimit-reset")
+            if remaining is not None and reset is not None:
+                self._rate.update(float(remaining), float(reset))
+            if status == 429:
+                self._rate.pause(float(headers.get("retry-after") or 1))
+        except (TypeError, ValueError):
+            pass
+
+    def _sync_client(self):
+        """One pooled httpx.Client so sends share a keep-alive (HTTP/2) connection."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    import httpx  # lazy import, workers that never send mail skip it
+
+                    self._http = httpx.Client(
+                        http2=True,
+                        headers=self._brevo_headers,
+                        timeout=BREVO_TIMEOUT_S,
+                        limits=httpx.Limits(max_connections=64, max_keepalive_connections=64),
+                    )
+        return self._http
+
+    def _brevo_payload(self, subject: str, body_text: str, body_html: Optional[str]) -> Dict[str, Any]:
+        """Message content shared by every recipient; callers add `to` or `messageVersions`."""
+        payload = {
+            "sender": self._brevo_sender,
+            "subject": subject,
+            "textContent": body_text or "",
+        }
+        if body_html:
+            payload["htmlContent"] = body_html
+        return payload
+
+    def _build_brevo_payload(self, to: str, subject: str, body_text: str, body_html: Optional[str]) -> bytes:
+        """Serialized request body for one recipient; headers live on the client."""
+        payload = self._brevo_payload(subject, body_text, body_html)
+        payload["to"] = [{"email": to}]
+        return orjson.dumps(payload)
+
+    def _build_brevo_batch_payload(
+        self, recipients: List[str], subject: str, body_text: str, body_html: Optional[str]
+    ) -> bytes:
+        """Serialized request body fanning out to every recipient via `messageVersions`."""
+        payload = self._brevo_payload(subject, body_text, body_html)
+        payload["messageVersions"] = [{"to": [{"email": r}]} for r in recipients]
+        return orjson.dumps(payload)
+
+    def _brevo_send_single(self, to: str, subject: str, body_text: str, body_html: Optional[str]) -> SendResult:
+        return self._post_brevo(self._build_brevo_payload(to, subject, body_text, body_html))
+
+    def _brevo_ready(self) -> bool:
         if not self.brevo_key:
             logging.error("BREVO_API_KEY missing")
             return False
-        try:
-            payload = {
-                "sender": {"email": self.from_email, "name": self.from_name},
-                "to": [{"email": to}],
-                "subject": subject,
-                "textContent": body_text or "",
-            }
-            if body_html:
-                payload["htmlContent"] = body_html
-
-            headers = {
-                "api-key": self.brevo_key,
-                "accept": "application/json",
-                "content-type": "application/json",
-            }
-            resp = requests.post("https://api.brevo.com/v3/smtp/email", json=payload, headers=headers, timeout=15)
-            if 200 <= resp.status_code < 300:
-                return True
-            # Consider 429/5xx transient
-            if resp.status_code in (429, 500, 502, 503, 504):
-                return False
+        return True
+
+    def _handle_brevo_response(self, resp) -> SendResult:
+        """Shared by every Brevo transport: track quota headers and classify the status."""
+        self._observe_rate_limit(resp.status_code, resp.headers)
+        result = _classify_status(resp.status_code)
+        if result is SendResult.FATAL:
             logging.error(f"Brevo send failed {resp.status_code}: {resp.text}")
-            return False
+        return result
+
+    def _brevo_request_error(self, exc: Exception, retryable: Optional[tuple] = None) -> SendResult:
+        """Log a failed request; RETRY only for `retryable` errors (default: any transient one)."""
+        logging.error(f"Brevo API error: {exc}")
+        return SendResult.RETRY if isinstance(exc, retryable or _transient_http_errors()) else SendResult.FATAL
+
+    def _post_brevo(self, body: bytes) -> SendResult:
+        if not self._brevo_ready():
+            return SendResult.FATAL
+        try:
+            if not self._rate.acquire(max_wait=SINGLE_SEND_MAX_WAIT_S):
+                logging.error("Brevo rate limit reached; not waiting for the next window")
+                return SendResult.RETRY
+            return self._handle_brevo_response(self._sync_client().post(self._brevo_url, content=body))
         except Exception as e:
-            logging.error(f"Brevo API error: {e}")
-            return False
+            return self._brevo_request_error(e)
+
+    async def _post_brevo_async(self, client, body: bytes) -> SendResult:
+        if not self._brevo_ready():
+            return SendResult.FATAL
+        try:
+            await self._rate.acquire_async()
+            return self._handle_brevo_response(await client.post(self._brevo_url, content=body))
+        except Exception as e:
+            return self._brevo_request_error(e)
+
+    async def _post_brevo_batch_async(self, client, body: bytes, count: int) -> Tuple[SendResult, int, bool]:
+        """
+        Post a messageVersions body addressed to `count` recipients.
+        Returns (result, number of messages accepted, whether a failure was
+        blamed on a recipient address).
+        """
+        import httpx  # lazy import, see send_bulk_async
+
+        if not self._brevo_ready():
+            return SendResult.FATAL, 0, False
+        try:
+            await self._rate.acquire_async()
+            resp = await client.post(
+                self._brevo_url, content=body, timeout=httpx.Timeout(BREVO_BATCH_TIMEOUT_S, connect=BREVO_TIMEOUT_S)
+            )
+        except Exception as e:
+            # A read timeout or dropped response may come after Brevo accepted
+            # the batch; retrying could mail every recipient again
+            return self._brevo_request_error(e, retryable=_unsent_http_errors()), 0, False
+        result = self._handle_brevo_response(resp)
+        if result is not SendResult.SENT:
+            return result, 0, _blames_recipient(resp.status_code, resp.content)
+        # One messageId per accepted version; a short list means a partial send
+        try:
+            data = orjson.loads(resp.content)
+            message_ids = data.get("messageIds") if isinstance(data, dict) else None
+        except orjson.JSONDecodeError:
+            message_ids = None
+        sent = count if not isinstance(message_ids, list) else min(len(message_ids), count)
+        return result, sent, False
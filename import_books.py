@@ -3,83 +3,108 @@ import os
 import sys
 import csv
 from datetime import datetime
-from typing import List, Dict
-
-from dotenv import load_dotenv
-from pymongo import MongoClient
-from pymongo.errors import ServerSelectionTimeoutError
+from typing import Iterator, Optional, Sequence, TYPE_CHECKING
 import traceback
-import certifi
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
 
 DEFAULT_FILE = os.path.join(os.path.dirname(__file__), 'books.xlsx')
+# Upserts sent to MongoDB per bulk_write round-trip
+BULK_CHUNK = 500
+
+
+def _header(h) -> str:
+    """Canonical column name: lower-cased, with 'book_id' accepted for 'bookid'."""
+    name = str(h).strip().lower() if h is not None else ''
+    return 'bookid' if name == 'book_id' else name
 
 
-def _try_read_excel(path: str) -> List[Dict]:
-    """Try reading Excel via openpyxl. Returns rows as dicts.
+def _try_read_excel(path: str) -> tuple[list[str], Iterator[Sequence]]:
+    """Try reading Excel via openpyxl. Returns (headers, rows) where headers are
+    canonical column names and rows is an iterator of value tuples.
     Expects headers: bookid, title, author, price (case-insensitive).
-    Raises Exception on failure so caller can fallback.
+    The workbook is opened read-only and streamed row by row; the header row
+    is read up front so failures raise here and the caller can fallback.
     """
     try:
         from openpyxl import load_workbook  # lazy import
     except Exception as e:
         raise RuntimeError("openpyxl not installed or failed to import") from e
 
-    wb = load_workbook(path, data_only=True)
-    ws = wb.active
-    rows = list(ws.iter_rows(values_only=True))
-    if not rows:
-        return []
-    headers = [str(h).strip().lower() if h is not None else '' for h in rows[0]]
-    out = []
-    for r in rows[1:]:
-        rec = {}
-        for i, v in enumerate(r):
-            key = headers[i] if i < len(headers) else f'col{i}'
-            rec[key] = v
-        out.append(rec)
-    return out
+    wb = load_workbook(path, data_only=True, read_only=True)
+    it = wb.active.iter_rows(values_only=True)
+    first = next(it, None)
+    if first is None:
+        wb.close()
+        raise ValueError("Worksheet is empty")
+
+    def _records() -> Iterator[Sequence]:
+        try:
+            yield from it
+        finally:
+            wb.close()
+
+    return [_header(h) for h in first], _records()
 
 
 essential_keys = {'bookid', 'title', 'author', 'price'}
 
 
-def _try_read_csv_text(path: str) -> List[Dict]:
-    """Fallback: parse the file as CSV text regardless of extension."""
-    with open(path, 'r', encoding='utf-8') as f:
-        rdr = csv.DictReader(f)
-        return list(rdr)
+def _try_read_csv_text(path: str) -> tuple[list[str], Iterator[Sequence]]:
+    """Fallback: parse the file as CSV text regardless of extension.
+    Same (headers, rows) shape as _try_read_excel; rows are streamed and the
+    header line is read up front so decode errors raise here.
+    """
+    f = open(path, 'r', encoding='utf-8')
+    try:
+        rdr = csv.reader(f)
+        first = next(rdr, [])
+    except Exception:
+        f.close()
+        raise
 
+    def _records() -> Iterator[Sequence]:
+        with f:
+            # Like DictReader, ignore blank lines
+            yield from (r for r in rdr if r)
 
-def _norm_row(row: dict) -> dict | None:
-    """Normalize a raw row into a book document or return None if invalid."""
-    # Flexible key access (case-insensitive)
-    lower = { (k or '').strip().lower(): v for k, v in row.items() }
-    if not essential_keys.issubset(lower.keys()):
-        # Try alternative header names
-        # Accept 'book_id' as alias
-        if 'book_id' in lower and 'bookid' not in lower:
-            lower['bookid'] = lower['book_id']
-        if not essential_keys.issubset(lower.keys()):
-            return None
+    return [_header(h) for h in first], _records()
+
+
+def _column_index(headers: list[str]) -> tuple[int, int, int, int] | None:
+    """Positions of bookid, title, author, price in the header row, or None if any is missing."""
+    pos = {name: i for i, name in enumerate(headers)}
+    if not essential_keys.issubset(pos.keys()):
+        return None
+    return pos['bookid'], pos['title'], pos['author'], pos['price']
+
+
+def _norm_row(row: Sequence, cols: tuple[int, int, int, int]) -> dict | None:
+    """Normalize a raw row into a book document or return None if invalid.
+    `cols` comes from _column_index on the file's header row.
+    """
+    n = len(row)
+    bid_raw, title_raw, author_raw, price_raw = (row[i] if i < n else None for i in cols)
 
     # book_id formatting
+    raw = str(bid_raw or '').strip()
     try:
-        bid_int = int(str(lower.get('bookid') or '').strip())
+        bid_int = int(raw)
         book_id = f"BK-{bid_int:04d}"
     except Exception:
         # If not numeric, keep as-is string
-        raw = str(lower.get('bookid') or '').strip()
         if not raw:
             return None
         book_id = raw
 
-    title = str(lower.get('title') or '').strip()
-    author = str(lower.get('author') or '').strip()
+    title = str(title_raw or '').strip()
+    author = str(author_raw or '').strip()
 
     # price normalization
-    price_raw = lower.get('price')
+    price_str = str(price_raw).strip() if price_raw is not None else ''
     try:
-        price = float(str(price_raw).strip()) if price_raw is not None and str(price_raw).strip() != '' else None
+        price = float(price_str) if price_str != '' else None
     except Exception:
         price = None
 
@@ -98,6 +123,12 @@ def _norm_row(row: dict) -> dict | None:
 
 def _connect_db() -> MongoClient:
     """Create a Mongo client quickly with short timeouts. Reads MONGO_URI from .env."""
+    # Heavy imports deferred until a DB connection is actually needed
+    import certifi
+    from dotenv import load_dotenv
+    from pymongo import MongoClient
+    from pymongo.errors import ServerSelectionTimeoutError
+
     load_dotenv()
     mongo_uri = os.environ.get('MONGO_URI') or ''
     if not mongo_uri:
@@ -127,28 +158,43 @@ def _connect_db() -> MongoClient:
     return client
 
 
+def _flush_upserts(collection, ops: list) -> tuple[int, int, int]:
+    """Run one unordered bulk_write. Returns (inserted, updated, failed) counts."""
+    from pymongo.errors import BulkWriteError
+
+    try:
+        res = collection.bulk_write(ops, ordered=False)
+        return res.upserted_count, res.modified_count, 0
+    except BulkWriteError as e:
+        details = e.details or {}
+        failed = len(details.get('writeErrors', []))
+        print(f"[import] {failed} row(s) failed to write in this chunk")
+        return details.get('nUpserted', 0), details.get('nModified', 0), failed
+
+
 def import_books(file_path: str = DEFAULT_FILE) -> dict:
     print(f"[import] Starting import from: {file_path}")
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
 
-    # Load rows
-    rows = []
+    # Open a row stream
+    headers: list[str] = []
+    rows: Optional[Iterator[Sequence]] = None
     # Try Excel first if extension suggests it
     tried_excel = False
     if os.path.splitext(file_path)[1].lower() in ('.xlsx', '.xlsm', '.xltx', '.xltm'):
         tried_excel = True
         try:
             print("[import] Attempting to read as Excel (openpyxl)...")
-            rows = _try_read_excel(file_path)
+            headers, rows = _try_read_excel(file_path)
         except Exception:
             print("[import] Excel read failed, will try CSV fallback")
-            rows = []
+            rows = None
     # If excel loading failed or ext not excel, try CSV text
-    if not rows:
+    if rows is None:
         try:
             print("[import] Reading as CSV text...")
-            rows = _try_read_csv_text(file_path)
+            headers, rows = _try_read_csv_text(file_path)
         except Exception:
             if not tried_excel:
                 # Last resort: raise
@@ -161,34 +207,65 @@ def import_books(file_path: str = DEFAULT_FILE) -> dict:
     updated = 0
     skipped = 0
 
+    cols = _column_index(headers)
+    if cols is None:
+        # Without the essential columns no row can be imported
+        skipped = sum(1 for _ in rows)
+        print(f"[import] Missing required headers (need: bookid,title,author,price; got: {headers})")
+        summary = {'inserted': inserted, 'updated': updated, 'skipped': skipped}
+        print(f"[import] Done. Summary: {summary}")
+        return summary
+
     client = _connect_db()
     # Get default DB from URI (should be 'hostel' after the normalization above)
     db = client.get_default_database()
     if db is None:
         db = client['hostel']
-    print(f"[import] Parsed {len(rows)} rows. Beginning upsert into 'books' collection...")
+    # Upserts are keyed on book_id; make sure lookups hit an index (idempotent)
+    try:
+        db.books.create_index([('book_id', 1)], unique=True)
+    except Exception as e:
+        print(f"[import] Warning: failed to ensure unique index on books.book_id: {e}")
+    print("[import] Beginning upsert into 'books' collection...")
+
+    from pymongo import UpdateOne
+
+    ops: list[UpdateOne] = []
+    # One timestamp for the whole run
+    now = datetime.utcnow()
+
+    def _flush() -> None:
+        nonlocal inserted, updated, skipped
+        ins, upd, bad = _flush_upserts(db.books, ops)
+        inserted += ins
+        updated += upd
+        skipped += bad
+        ops.clear()
 
     for raw in rows:
-        doc = _norm_row(raw)
+        doc = _norm_row(raw, cols)
         if not doc:
             skipped += 1
             continue
-        # Try update, else insert
-        now = datetime.utcnow()
-        existing = db.books.find_one({'book_id': doc['book_id']}, {'_id': 1, 'status': 1})
-        if existing:
-            # Preserve existing status if set, update other fields
-            status = existing.get('status', 'available')
-            upd = {k: v for k, v in doc.items()}
-            upd['status'] = status
-            upd['updated_at'] = now
-            res = db.books.update_one({'_id': existing['_id']}, {'$set': upd})
-            updated += res.modified_count
-        else:
-            doc['status'] = 'available'
-            doc['created_at'] = now
-            db.books.insert_one(doc)
-            inserted += 1
+        # Upsert by book_id; status/created_at are only set on insert so an
+        # existing book keeps its current status
+        ops.append(UpdateOne(
+            {'book_id': doc['book_id']},
+            {
+                '$set': {
+                    'title': doc['title'],
+                    'author': doc['author'],
+                    'price': doc['price'],
+                    'updated_at': now,
+                },
+                '$setOnInsert': {'status': 'available', 'created_at': now},
+            },
+            upsert=True,
+        ))
+        if len(ops) >= BULK_CHUNK:
+            _flush()
+    if ops:
+        _flush()
     summary = {'inserted': inserted, 'updated': updated, 'skipped': skipped}
     print(f"[import] Done. Summary: {summary}")
     return summary